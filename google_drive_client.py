@@ -1,12 +1,20 @@
+import atexit
 import os
 import json
+import hashlib
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
 from googleapiclient.http import MediaFileUpload
 from googleapiclient.errors import HttpError
+import tqdm as progress_bar
 
 
 class Color:
@@ -22,6 +30,49 @@ class Color:
     END = "\033[0m"
 
 
+# Files smaller than resumable_threshold_mb are sent in a single multipart
+# request; larger ones use a resumable upload sent in upload_chunk_size_mb pieces
+DEFAULT_RESUMABLE_THRESHOLD_MB = 5
+DEFAULT_UPLOAD_CHUNK_SIZE_MB = 32
+
+BYTES_PER_GB = 1 << 30
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+FOLDER_QUERY = f"mimeType='{FOLDER_MIME_TYPE}' and trashed = false"
+
+# Drive query string literals need backslashes and single quotes escaped
+_QUERY_ESCAPE = str.maketrans({"\\": "\\\\", "'": "\\'"})
+
+
+def escape_query_value(value):
+    return value.translate(_QUERY_ESCAPE)
+
+
+# 403 reasons Drive uses for quota errors that should be retried with backoff
+RATE_LIMIT_REASONS = {"userRateLimitExceeded", "rateLimitExceeded"}
+
+
+def is_rate_limit_error(error):
+    """Return True if an HttpError is a Drive rate limit rather than a permission error."""
+    try:
+        details = json.loads(error.content).get("error", {}).get("errors", [])
+    except (ValueError, AttributeError):
+        return False
+    return any(detail.get("reason") in RATE_LIMIT_REASONS for detail in details)
+
+
+def file_md5(path, block_size=1024 * 1024):
+    """Return the hex MD5 digest of a local file, as reported by Drive's md5Checksum."""
+    with open(path, "rb") as fd:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+, hashes in a C loop
+            return hashlib.file_digest(fd, "md5").hexdigest()
+
+        digest = hashlib.md5()
+        for block in iter(lambda: fd.read(block_size), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
 SUCCESS_PAGE = """
 <!DOCTYPE html>
 <html>
@@ -36,6 +87,36 @@ SUCCESS_PAGE = """
 """
 
 
+class UploadCancelled(Exception):
+    """Raised inside an upload once the client's stop_event is set."""
+
+
+class RateLimiter:
+    """Token bucket shared by all upload threads to cap Drive API requests per second."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent. A rate of 0 or less disables the limit."""
+        if self.rate <= 0:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # reserve a token; a negative balance is the wait owed by this caller
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
 class GoogleDriveClient:
     SCOPES = [
         "https://www.googleapis.com/auth/drive.file",
@@ -44,11 +125,81 @@ class GoogleDriveClient:
         "https://www.googleapis.com/auth/drive",
     ]
 
-    def __init__(self, config):
+    def __init__(self, config, stop_event=None):
         self.config = config
+        # set to abandon in-flight uploads between chunks (e.g. on CTRL-C)
+        self.stop_event = stop_event or threading.Event()
+        self._local = threading.local()
+        self._failed_log_lock = threading.Lock()
+        self._failed_log_fh = None
+        self._folder_lock = threading.Lock()
+        self._upload_pool = None
+        self._upload_pool_lock = threading.Lock()
+        self._folder_cache = {}  # (parent_id, folder_name) -> folder_id
+        self._path_cache = {}  # folder_path -> folder_id
+        self._discovery_document = None
         self.service = None
         self.credentials = None
         self.root_folder_id = None
+        self.verbose = config.get("verbose", False)
+        self.resumable_threshold = (
+            int(config.get("resumable_threshold_mb", DEFAULT_RESUMABLE_THRESHOLD_MB))
+            * 1024
+            * 1024
+        )
+        # Drive requires resumable chunks to be multiples of 256 KiB
+        self.upload_chunk_size = (
+            int(config.get("upload_chunk_size_mb", DEFAULT_UPLOAD_CHUNK_SIZE_MB))
+            * 1024
+            * 1024
+        )
+        self._rate_limiter = RateLimiter(
+            float(config.get("max_requests_per_second", 10))
+        )
+
+    def _debug(self, message):
+        """Print per-request progress details only when verbose output is enabled."""
+        if self.verbose:
+            progress_bar.tqdm.write(message)
+
+    def _log_failed_upload(self, message):
+        """Append to the failed uploads log through one buffered handle per run."""
+        with self._failed_log_lock:
+            if self._failed_log_fh is None:
+                failed_log = self.config.get("failed_log", "failed-uploads.log")
+                self._failed_log_fh = open(failed_log, "a", buffering=1 << 16)
+                atexit.register(self._failed_log_fh.close)
+            self._failed_log_fh.write(message)
+            # flushed per entry so nothing is lost on a hard exit or crash
+            self._failed_log_fh.flush()
+
+    def _build_service(self):
+        """Build a Drive service, parsing the discovery document once per client."""
+        if self._discovery_document is None:
+            document = discovery_cache.get_static_doc("drive", "v3")
+            self._discovery_document = json.loads(document) if document else {}
+        if not self._discovery_document:
+            return build("drive", "v3", credentials=self.credentials)
+        return build_from_document(
+            self._discovery_document, credentials=self.credentials
+        )
+
+    @property
+    def service(self):
+        """Drive service for the calling thread, built on first use.
+
+        googleapiclient Resource objects share an httplib2 connection that is
+        not thread-safe, so every worker thread gets its own instance.
+        """
+        service = getattr(self._local, "service", None)
+        if service is None and self.credentials:
+            service = self._build_service()
+            self._local.service = service
+        return service
+
+    @service.setter
+    def service(self, value):
+        self._local.service = value
 
     def authenticate(self):
         """Handle the OAuth flow and return True if successful."""
@@ -101,8 +252,8 @@ class GoogleDriveClient:
                 print(f"{Color.GREEN}Token saved to {token_file}{Color.END}")
 
         try:
-            self.service = build("drive", "v3", credentials=creds)
             self.credentials = creds
+            self.service = self._build_service()
 
             # Get user email
             user_info = self.service.about().get(fields="user").execute()
@@ -122,42 +273,69 @@ class GoogleDriveClient:
             print(f"{Color.RED}Failed to initialize Drive service: {e}{Color.END}")
             return False
 
-    def _handle_upload_with_refresh(self, request):
-        """Execute request with token refresh handling."""
-        try:
+    def _execute(self, request):
+        """Execute request, sending resumable uploads one chunk at a time.
+
+        stop_event is checked between chunks, so a stopped run doesn't wait
+        for a multi-GB upload to finish.
+        """
+        if getattr(request, "resumable", None) is None:
             return request.execute()
-        except HttpError as e:
-            if e.resp.status in [401, 403]:
-                if self.credentials.refresh_token:
-                    print(f"{Color.YELLOW}Token expired, refreshing...{Color.END}")
-                    self.credentials.refresh(Request())
-                    return self._handle_upload_with_refresh(request)
-                else:
-                    print(
+
+        response = None
+        while response is None:
+            if self.stop_event.is_set():
+                raise UploadCancelled("upload cancelled")
+            _, response = request.next_chunk()
+        return response
+
+    def _handle_upload_with_refresh(self, request, max_attempts=3):
+        """Execute request with token refresh handling and backoff on rate limits."""
+        for attempt in range(max_attempts):
+            try:
+                self._rate_limiter.acquire()
+                return self._execute(request)
+            except HttpError as e:
+                if attempt == max_attempts - 1:
+                    raise
+
+                if e.resp.status == 401:
+                    if self.credentials.refresh_token:
+                        progress_bar.tqdm.write(
+                            f"{Color.YELLOW}Token expired, refreshing...{Color.END}"
+                        )
+                        self.credentials.refresh(Request())
+                        continue
+                    progress_bar.tqdm.write(
                         f"{Color.YELLOW}Token refresh failed, re-authenticating...{Color.END}"
                     )
                     if self.authenticate():
-                        return self._handle_upload_with_refresh(request)
-            raise
+                        continue
+                elif (
+                    e.resp.status == 429
+                    or e.resp.status >= 500
+                    or (e.resp.status == 403 and is_rate_limit_error(e))
+                ):
+                    time.sleep(2**attempt + random.random())
+                    continue
+                raise
 
     def find_folder(self, folder_name, parent_id=None):
         """Find a folder by name in Google Drive and return its ID, excluding trashed folders."""
-        # Escape single quotes in folder name
-        escaped_folder_name = folder_name.replace("'", "\\'")
-        query = f"name='{escaped_folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed = false"
+        cache_key = (parent_id, folder_name)
+        if cache_key in self._folder_cache:
+            return self._folder_cache[cache_key]
+
+        query = f"name='{escape_query_value(folder_name)}' and {FOLDER_QUERY}"
         if parent_id:
             query += f" and '{parent_id}' in parents"
 
         try:
-            response = (
-                self.service.files()
-                .list(q=query, spaces="drive", fields="files(id, name)")
-                .execute()
-            )
-            if response.get("files"):
-                return response.get("files")[0].get("id")
+            for folder in self._list_files(query, "id, name"):
+                self._folder_cache[cache_key] = folder["id"]
+                return folder["id"]
         except Exception as e:
-            print(
+            progress_bar.tqdm.write(
                 f"{Color.RED}Failed to find folder {folder_name}: {str(e)}{Color.END}"
             )
         return None
@@ -166,7 +344,7 @@ class GoogleDriveClient:
         """Create a folder in Google Drive and return its ID."""
         file_metadata = {
             "name": folder_name,
-            "mimeType": "application/vnd.google-apps.folder",
+            "mimeType": FOLDER_MIME_TYPE,
         }
         if parent_id:
             file_metadata["parents"] = [parent_id]
@@ -175,16 +353,226 @@ class GoogleDriveClient:
             folder = self._handle_upload_with_refresh(
                 self.service.files().create(body=file_metadata, fields="id")
             )
+            self._folder_cache[(parent_id, folder_name)] = folder.get("id")
             return folder.get("id")
         except Exception as e:
-            print(
+            progress_bar.tqdm.write(
                 f"{Color.RED}Failed to create folder {folder_name}: {str(e)}{Color.END}"
             )
             return None
 
+    def _list_files(self, query, fields):
+        """Yield every file matching query, following nextPageToken.
+
+        Requests the maximum page size; the API default is only 100.
+        """
+        page_token = None
+        while True:
+            response = self._handle_upload_with_refresh(
+                self.service.files().list(
+                    q=query,
+                    spaces="drive",
+                    pageSize=1000,
+                    pageToken=page_token,
+                    fields=f"nextPageToken, files({fields})",
+                )
+            )
+            yield from response.get("files", [])
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+    def _list_children_by_name(self, parent_id, names, condition, fields):
+        """Yield the children of parent_id named in names that match condition.
+
+        Names are matched with one OR query per batch instead of one
+        files().list call per name.
+        """
+        names = sorted(set(names))
+        batch_size = 40  # keep the query string well below URL length limits
+
+        for start in range(0, len(names), batch_size):
+            batch = names[start : start + batch_size]
+            name_clauses = " or ".join(
+                f"name='{escape_query_value(name)}'" for name in batch
+            )
+            query = f"'{parent_id}' in parents and {condition} and ({name_clauses})"
+            yield from self._list_files(query, fields)
+
+    def cache_child_folders(self, parent_id):
+        """Fill the folder cache with every folder directly under parent_id.
+
+        One paginated listing replaces the per-name lookups that would
+        otherwise be made for each of these folders later on.
+        """
+        try:
+            query = f"'{parent_id}' in parents and {FOLDER_QUERY}"
+            with self._folder_lock:
+                for folder in self._list_files(query, "id, name"):
+                    self._folder_cache.setdefault(
+                        (parent_id, folder["name"]), folder["id"]
+                    )
+        except Exception as e:
+            progress_bar.tqdm.write(
+                f"{Color.RED}Failed to list folders: {str(e)}{Color.END}"
+            )
+
+    def find_folders(self, folder_names, parent_id):
+        """Find several folders under one parent, returning a {name: id} dict.
+
+        Returns None if the lookup fails, so callers don't mistake folders
+        that couldn't be looked up for missing ones.
+        """
+        found = {}
+        try:
+            for folder in self._list_children_by_name(
+                parent_id, folder_names, FOLDER_QUERY, "id, name"
+            ):
+                found.setdefault(folder["name"], folder["id"])
+        except Exception as e:
+            progress_bar.tqdm.write(
+                f"{Color.RED}Failed to find folders: {str(e)}{Color.END}"
+            )
+            return None
+        return found
+
+    def list_existing_files(self, folder_id, filenames):
+        """Return {name: [file, ...]} for the given names already in a folder.
+
+        Each file is a dict with its id and md5Checksum. Returns None if the
+        lookup fails, so callers can fall back to checking files one by one.
+        """
+        existing = {}
+        try:
+            for drive_file in self._list_children_by_name(
+                folder_id, filenames, "trashed = false", "id, name, md5Checksum"
+            ):
+                existing.setdefault(drive_file["name"], []).append(drive_file)
+        except Exception as e:
+            progress_bar.tqdm.write(
+                f"{Color.RED}Failed to list existing files: {str(e)}{Color.END}"
+            )
+            return None
+        return existing
+
+    def create_folders(self, folder_names, parent_id):
+        """Create several folders under one parent, returning a {name: id} dict.
+
+        Requests are sent through Drive batch HTTP requests (up to 100 calls
+        per HTTP round-trip).
+        """
+        folder_names = sorted(set(folder_names))
+        created = {}
+        batch_size = 100  # Drive batch request limit
+
+        def on_created(request_id, response, exception):
+            if exception:
+                progress_bar.tqdm.write(
+                    f"{Color.RED}Failed to create folder {request_id}: {str(exception)}{Color.END}"
+                )
+            else:
+                created[request_id] = response.get("id")
+
+        for start in range(0, len(folder_names), batch_size):
+            batch = self.service.new_batch_http_request(callback=on_created)
+            for folder_name in folder_names[start : start + batch_size]:
+                file_metadata = {
+                    "name": folder_name,
+                    "mimeType": FOLDER_MIME_TYPE,
+                    "parents": [parent_id],
+                }
+                batch.add(
+                    self.service.files().create(body=file_metadata, fields="id"),
+                    request_id=folder_name,
+                )
+            try:
+                self._handle_upload_with_refresh(batch)
+            except Exception as e:
+                progress_bar.tqdm.write(
+                    f"{Color.RED}Failed to create folders: {str(e)}{Color.END}"
+                )
+
+        for folder_name, folder_id in created.items():
+            progress_bar.tqdm.write(
+                f"    > Created new folder: {folder_name} (ID: {folder_id})"
+            )
+        return created
+
+    def prepare_folders(self, folder_paths):
+        """Resolve or create the folders of many paths up front.
+
+        Walks the paths one level at a time and issues one batched lookup per
+        parent folder, then creates the missing ones in a batch request,
+        filling the folder cache used by navigate_folders. Returns a
+        {folder_path: folder_id} dict (None for paths that couldn't be looked
+        up or created).
+        """
+        folder_paths = set(folder_paths)
+        paths = {
+            folder_path: [part for part in folder_path.split(os.sep) if part]
+            for folder_path in folder_paths
+        }
+        depth = max((len(parts) for parts in paths.values()), default=0)
+        failed_lookups = set()  # (parent_id, folder_name) that couldn't be looked up
+
+        with self._folder_lock:
+            for level in range(depth):
+                wanted = {}  # parent_id -> folder names to look up
+                for parts in paths.values():
+                    if len(parts) <= level:
+                        continue
+                    parent_id = self.root_folder_id
+                    for folder_name in parts[:level]:
+                        parent_id = self._folder_cache.get((parent_id, folder_name))
+                        if not parent_id:
+                            break
+                    if (
+                        parent_id
+                        and (parent_id, parts[level]) not in self._folder_cache
+                    ):
+                        wanted.setdefault(parent_id, set()).add(parts[level])
+
+                for parent_id, folder_names in wanted.items():
+                    found = self.find_folders(folder_names, parent_id)
+                    if found is None:
+                        # don't create folders that may already exist
+                        failed_lookups.update(
+                            (parent_id, folder_name) for folder_name in folder_names
+                        )
+                        continue
+                    missing = folder_names - found.keys()
+                    if missing:
+                        found.update(self.create_folders(missing, parent_id))
+                    for folder_name, folder_id in found.items():
+                        self._folder_cache[(parent_id, folder_name)] = folder_id
+
+            return {
+                folder_path: (
+                    None
+                    if self._has_failed_lookup(parts, failed_lookups)
+                    else self.navigate_folders(folder_path)
+                )
+                for folder_path, parts in paths.items()
+            }
+
+    def _has_failed_lookup(self, parts, failed_lookups):
+        """Whether resolving the folder path parts hits a failed batched lookup."""
+        parent_id = self.root_folder_id
+        for folder_name in parts:
+            if (parent_id, folder_name) in failed_lookups:
+                return True
+            parent_id = self._folder_cache.get((parent_id, folder_name))
+            if not parent_id:
+                return False
+        return False
+
     def navigate_folders(self, folder_path):
         """Navigate through folder structure, creating folders if necessary"""
-        print(f"  > Navigating to folder path: {folder_path}")
+        normalized_path = folder_path.strip(os.sep)
+        if normalized_path in self._path_cache:
+            return self._path_cache[normalized_path]
+
+        self._debug(f"  > Navigating to folder path: {folder_path}")
 
         parts = folder_path.split(os.sep)
         current_parent = self.root_folder_id
@@ -197,7 +585,7 @@ class GoogleDriveClient:
 
             if folder_id:
                 current_parent = folder_id
-                print(
+                self._debug(
                     f"    > Found existing folder: {folder_name} (ID: {current_parent})"
                 )
             else:
@@ -205,51 +593,73 @@ class GoogleDriveClient:
                 new_folder_id = self.create_folder(folder_name, current_parent)
                 if new_folder_id:
                     current_parent = new_folder_id
-                    print(
+                    progress_bar.tqdm.write(
                         f"    > Created new folder: {folder_name} (ID: {current_parent})"
                     )
                 else:
-                    print(
+                    progress_bar.tqdm.write(
                         f"    {Color.RED}Failed to create folder: {folder_name}{Color.END}"
                     )
                     return None
+
+        self._path_cache[normalized_path] = current_parent
         return current_parent
 
-    def upload_file(self, local_path, folder_name, filename):
-        """Upload file to Google Drive with retry logic and idempotency check, excluding trashed files."""
+    def upload_file(
+        self, local_path, folder_name, filename, existing_files=None, folder_id=None
+    ):
+        """Upload file to Google Drive with retry logic and idempotency check, excluding trashed files.
+
+        folder_id, when given, is the already resolved ID of folder_name (see
+        prepare_folders). existing_files, when given, lists the same-named files
+        already in the target folder (see list_existing_files) and replaces
+        the Drive lookup.
+        """
         try:
-            print(f"    > Getting folder ID for path: {folder_name}")
-            folder_id = self.navigate_folders(folder_name)
+            if folder_id is None:
+                self._debug(f"    > Getting folder ID for path: {folder_name}")
+                # Serialize folder creation so concurrent uploads don't race to
+                # create duplicate folders with the same name
+                with self._folder_lock:
+                    folder_id = self.navigate_folders(folder_name)
             if not folder_id:
                 return False
 
-            # Escape single quotes in filename
-            escaped_filename = filename.replace("'", "\\'")
             # Check if file already exists and is not in the trash
-            query = f"name='{escaped_filename}' and '{folder_id}' in parents and trashed = false"
-            response = (
-                self.service.files()
-                .list(q=query, spaces="drive", fields="files(id)")
-                .execute()
-            )
-            if response.get("files"):
-                print(
-                    f"    > File '{filename}' already exists in Google Drive. Skipping upload."
+            if existing_files is None:
+                query = f"name='{escape_query_value(filename)}' and '{folder_id}' in parents and trashed = false"
+                existing_files = list(self._list_files(query, "id, md5Checksum"))
+            if existing_files:
+                remote_checksums = {f.get("md5Checksum") for f in existing_files}
+                if None in remote_checksums or file_md5(local_path) in remote_checksums:
+                    progress_bar.tqdm.write(
+                        f"    > File '{filename}' already exists in Google Drive. Skipping upload."
+                    )
+                    return True
+                # never overwrite the remote copy, keep both side by side
+                progress_bar.tqdm.write(
+                    f"    {Color.YELLOW}> File '{filename}' exists in Google Drive with "
+                    f"different content. Uploading it as a new file.{Color.END}"
                 )
-                return True
 
             file_metadata = {"name": filename, "parents": [folder_id]}
-            print(f"    > Uploading {filename} to folder ID: {folder_id}")
+            progress_bar.tqdm.write(
+                f"    > Uploading {filename} to folder ID: {folder_id}"
+            )
 
-            media = MediaFileUpload(local_path, resumable=True)
+            if os.path.getsize(local_path) < self.resumable_threshold:
+                media = MediaFileUpload(local_path, resumable=False)
+            else:
+                media = MediaFileUpload(
+                    local_path, chunksize=self.upload_chunk_size, resumable=True
+                )
 
             max_retries = int(self.config.get("max_retries", 3))
             retry_delay = int(self.config.get("retry_delay", 5))
-            failed_log = self.config.get("failed_log", "failed-uploads.log")
 
             for attempt in range(max_retries):
                 try:
-                    print(f"    > Attempt {attempt + 1} of {max_retries}...")
+                    self._debug(f"    > Attempt {attempt + 1} of {max_retries}...")
 
                     # Add shared drive support for file creation
                     create_params = {
@@ -261,30 +671,96 @@ class GoogleDriveClient:
                     request = self.service.files().create(**create_params)
                     response = self._handle_upload_with_refresh(request)
 
-                    print(
+                    progress_bar.tqdm.write(
                         f"    {Color.GREEN}Success! File ID: {response.get('id')}{Color.END}"
                     )
                     return True
 
                 except Exception as e:
+                    if self.stop_event.is_set():
+                        return False
                     if attempt < max_retries - 1:
-                        print(
-                            f"    {Color.YELLOW}Retry after {retry_delay} seconds...{Color.END}"
+                        delay = retry_delay * 2**attempt
+                        progress_bar.tqdm.write(
+                            f"    {Color.YELLOW}Retry after {delay} seconds...{Color.END}"
                         )
-                        import time
-
-                        time.sleep(retry_delay)
+                        time.sleep(delay)
                     else:
-                        print(f"{Color.RED}Upload failed: {str(e)}{Color.END}")
-                        with open(failed_log, "a") as log:
-                            log.write(
-                                f"{datetime.now()}: Failed to upload {filename} - {str(e)}\n"
-                            )
+                        progress_bar.tqdm.write(
+                            f"{Color.RED}Upload failed: {str(e)}{Color.END}"
+                        )
+                        self._log_failed_upload(
+                            f"{datetime.now()}: Failed to upload {filename} - {str(e)}\n"
+                        )
                         return False
         except Exception as e:
-            print(f"{Color.RED}Upload preparation failed: {str(e)}{Color.END}")
+            progress_bar.tqdm.write(
+                f"{Color.RED}Upload preparation failed: {str(e)}{Color.END}"
+            )
             return False
 
+    def upload_files(self, tasks, max_workers=None):
+        """Upload several files concurrently.
+
+        Each task is a (local_path, folder_name, filename) tuple, as accepted by
+        upload_file. Returns the upload results in the same order as tasks.
+        max_workers (default upload_workers) sizes the client's shared upload
+        pool when it is first created.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
+
+        # Check which files already exist with one query per target folder
+        # instead of one per file
+        filenames_by_folder = {}
+        for _, folder_name, filename in tasks:
+            filenames_by_folder.setdefault(folder_name, set()).add(filename)
+
+        folder_ids = self.prepare_folders(filenames_by_folder)
+        existing_by_folder = {}
+        for folder_name, filenames in filenames_by_folder.items():
+            if folder_ids[folder_name]:
+                existing_by_folder[folder_name] = self.list_existing_files(
+                    folder_ids[folder_name], filenames
+                )
+
+        def upload(task):
+            local_path, folder_name, filename = task
+            if self.stop_event.is_set():
+                return False
+            folder_id = folder_ids[folder_name]
+            if not folder_id:
+                progress_bar.tqdm.write(
+                    f"{Color.RED}Upload failed: no folder for {filename}{Color.END}"
+                )
+                return False
+            existing = existing_by_folder.get(folder_name)
+            existing_files = None if existing is None else existing.get(filename, [])
+            return self.upload_file(
+                local_path, folder_name, filename, existing_files, folder_id
+            )
+
+        if max_workers is None:
+            max_workers = int(self.config.get("upload_workers", 4))
+
+        if max_workers <= 1:
+            return [upload(task) for task in tasks]
+
+        return list(self._get_upload_pool(max_workers).map(upload, tasks))
+
+    def _get_upload_pool(self, max_workers):
+        """Return the upload executor, shared by every upload_files call.
+
+        Its threads live for the whole run, so each keeps its thread-local
+        Drive service and connections instead of building new ones per batch.
+        """
+        with self._upload_pool_lock:
+            if self._upload_pool is None:
+                self._upload_pool = ThreadPoolExecutor(max_workers=max_workers)
+                atexit.register(self._upload_pool.shutdown, wait=False)
+            return self._upload_pool
+
     def initialize_root_folder(self):
         """Find or create the root folder."""
         root_folder_name = self.config.get(
@@ -294,6 +770,7 @@ class GoogleDriveClient:
         if folder_id:
             self.root_folder_id = folder_id
             print(f"Found root folder '{root_folder_name}' with ID: {folder_id}")
+            self.cache_child_folders(folder_id)
         else:
             self.root_folder_id = self.create_folder(root_folder_name)
             if self.root_folder_id:
@@ -310,8 +787,8 @@ class GoogleDriveClient:
             user_email = about["user"]["emailAddress"]
             quota = about["storageQuota"]
 
-            used = int(quota.get("usage", 0)) / (1024 * 1024 * 1024)  # Convert to GB
-            total = int(quota.get("limit", 0)) / (1024 * 1024 * 1024)  # Convert to GB
+            used = int(quota.get("usage", 0)) / BYTES_PER_GB
+            total = int(quota.get("limit", 0)) / BYTES_PER_GB
 
             print(
                 f"{Color.GREEN}✓ Successfully connected to Google Drive API{Color.END}"
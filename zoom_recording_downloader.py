@@ -11,20 +11,28 @@
 # Forked from:  https://gist.github.com/danaspiegel/c33004e52ffacb60c24215abf8301680
 
 # System modules
+import atexit
 import base64
+import functools
 import json
 import os
+import queue
 import re as regex
 import signal
 import sys as system
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timezone, timedelta
+from urllib.parse import parse_qs, urlsplit
 
 # Installed modules
 import dateutil.parser as parser
 import pathvalidate as path_validate
 import requests
 import tqdm as progress_bar
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from zoneinfo import ZoneInfo
 from google_drive_client import GoogleDriveClient
 
@@ -77,6 +85,7 @@ def config(section, key, default=""):
 ACCOUNT_ID = config("OAuth", "account_id", LookupError)
 CLIENT_ID = config("OAuth", "client_id", LookupError)
 CLIENT_SECRET = config("OAuth", "client_secret", LookupError)
+ACCESS_TOKEN_FILE = config("OAuth", "token_file", "zoom-token.json")
 
 APP_VERSION = "3.1 (Google Drive Edition)"
 
@@ -100,6 +109,10 @@ COMPLETED_MEETING_IDS_LOG = config(
     "Storage", "completed_log", "completed-downloads.log"
 )
 VERBOSE_URL = config("Storage", "verbose_url", False)
+DOWNLOAD_WORKERS = int(config("Storage", "download_workers", 4))
+DOWNLOAD_SEGMENTS = int(config("Storage", "download_segments", 4))
+# only split files at least this large into parallel ranged requests
+SEGMENTED_DOWNLOAD_THRESHOLD = 64 * 1024 * 1024
 COMPLETED_MEETING_IDS = set()
 
 MEETING_TIMEZONE = ZoneInfo(config("Recordings", "timezone", "UTC"))
@@ -129,11 +142,44 @@ DELETE_AFTER_DOWNLOAD = config("Storage", "delete_after_download", False)
 ACCESS_TOKEN = None
 AUTHORIZATION_HEADER = {}
 
+# set on CTRL-C so in-flight downloads and uploads stop at their next chunk
+STOP_EVENT = threading.Event()
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a download once STOP_EVENT is set"""
+
+
+# Shared HTTP session so repeated Zoom API calls reuse keep-alive connections,
+# sized so every download worker and segment can keep its own connection
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=max(32, DOWNLOAD_WORKERS * DOWNLOAD_SEGMENTS),
+        max_retries=Retry(
+            total=8,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # also retry the OAuth token POST, and wait as long as Zoom asks on 429
+            allowed_methods=frozenset(["GET", "POST", "DELETE", "HEAD"]),
+            respect_retry_after_header=True,
+            # hand the last response back once retries run out, so the callers'
+            # status checks still apply instead of a RetryError being raised
+            raise_on_status=False,
+        ),
+    ),
+)
+# download URLs carry the access token in their query string, don't send the
+# API headers set on SESSION to the file hosts they redirect to
+DOWNLOAD_HEADERS = {"Authorization": None, "Content-Type": None}
+
 
 def setup_google_drive():
     """Initialize Google Drive client with OAuth authentication"""
     try:
-        drive_client = GoogleDriveClient(CONF.get("GoogleDrive", {}))
+        drive_client = GoogleDriveClient(CONF.get("GoogleDrive", {}), STOP_EVENT)
         if not drive_client.authenticate():
             choice = input(
                 "Would you like to continue with local storage instead? (y/n): "
@@ -162,8 +208,71 @@ def setup_google_drive():
         return None
 
 
-def load_access_token():
+def load_cached_access_token():
+    """Return the access token saved by a previous run, if it is still valid"""
+    if not ACCESS_TOKEN_FILE:
+        return None
+
+    try:
+        with open(ACCESS_TOKEN_FILE, "r") as fd:
+            cached = json.load(fd)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    # only reuse tokens issued for the configured app, with a minute to spare
+    if (
+        cached.get("account_id") != ACCOUNT_ID
+        or cached.get("client_id") != CLIENT_ID
+        or cached.get("expires_at", 0) < time.time() + 60
+    ):
+        return None
+
+    return cached.get("access_token")
+
+
+def save_cached_access_token(access_token, expires_in):
+    if not ACCESS_TOKEN_FILE:
+        return
+
+    cached = {
+        "account_id": ACCOUNT_ID,
+        "client_id": CLIENT_ID,
+        "access_token": access_token,
+        "expires_at": time.time() + int(expires_in),
+    }
+    try:
+        fd = os.open(ACCESS_TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as token_file:
+            json.dump(cached, token_file)
+    except OSError as e:
+        print(f"{Color.YELLOW}### Could not cache access token: {e}{Color.END}")
+
+
+def clear_cached_access_token():
+    if ACCESS_TOKEN_FILE and os.path.exists(ACCESS_TOKEN_FILE):
+        os.remove(ACCESS_TOKEN_FILE)
+
+
+def set_access_token(access_token):
+    global ACCESS_TOKEN
+    global AUTHORIZATION_HEADER
+
+    ACCESS_TOKEN = access_token
+    AUTHORIZATION_HEADER = {
+        "Authorization": f"Bearer {ACCESS_TOKEN}",
+        "Content-Type": "application/json",
+    }
+    # sent with every Zoom API request made through SESSION
+    SESSION.headers.update(AUTHORIZATION_HEADER)
+
+
+def load_access_token(use_cache=True):
     """OAuth function, thanks to https://github.com/freelimiter"""
+    cached_token = load_cached_access_token() if use_cache else None
+    if cached_token:
+        set_access_token(cached_token)
+        return
+
     url = f"https://zoom.us/oauth/token?grant_type=account_credentials&account_id={ACCOUNT_ID}"
 
     client_cred = f"{CLIENT_ID}:{CLIENT_SECRET}"
@@ -176,17 +285,11 @@ def load_access_token():
         "Content-Type": "application/x-www-form-urlencoded",
     }
 
-    response = json.loads(requests.request("POST", url, headers=headers).text)
-
-    global ACCESS_TOKEN
-    global AUTHORIZATION_HEADER
+    response = SESSION.post(url, headers=headers).json()
 
     try:
-        ACCESS_TOKEN = response["access_token"]
-        AUTHORIZATION_HEADER = {
-            "Authorization": f"Bearer {ACCESS_TOKEN}",
-            "Content-Type": "application/json",
-        }
+        set_access_token(response["access_token"])
+        save_cached_access_token(ACCESS_TOKEN, response.get("expires_in", 3600))
 
     except KeyError:
         print(f"{Color.RED}### The key 'access_token' wasn't found.{Color.END}")
@@ -194,9 +297,52 @@ def load_access_token():
         system.exit(1)
 
 
+TOKEN_LOCK = threading.Lock()
+
+
+def reauthenticate_on_401(response, *args, **kwargs):
+    """SESSION response hook: when Zoom rejects the access token (expired or
+    revoked), request a new one and send the request again once with it
+    """
+    if response.status_code != 401:
+        return response
+
+    request = response.request
+    authorization = request.headers.get("Authorization", "")
+    if authorization.startswith("Bearer "):
+        used_token = authorization[len("Bearer ") :]
+    else:
+        # download URLs carry the token in their query string
+        query = parse_qs(urlsplit(request.url).query)
+        used_token = query.get("access_token", [None])[0]
+    if not used_token:
+        return response  # not authenticated with our token (e.g. the OAuth call)
+
+    with TOKEN_LOCK:
+        # another thread may have renewed the token already
+        if used_token == ACCESS_TOKEN:
+            clear_cached_access_token()
+            load_access_token(use_cache=False)
+
+    retry = request.copy()
+    retry.hooks = {"response": []}  # only resend once
+    if authorization:
+        retry.headers["Authorization"] = f"Bearer {ACCESS_TOKEN}"
+    else:
+        retry.url = request.url.replace(
+            f"access_token={used_token}", f"access_token={ACCESS_TOKEN}"
+        )
+
+    response.close()
+    return SESSION.send(retry, **kwargs)
+
+
+SESSION.hooks["response"].append(reauthenticate_on_401)
+
+
 def get_users():
     """loop through pages and return all users"""
-    response = requests.get(url=API_ENDPOINT_USER_LIST, headers=AUTHORIZATION_HEADER)
+    response = SESSION.get(url=API_ENDPOINT_USER_LIST)
 
     if not response.ok:
         print(response)
@@ -210,11 +356,19 @@ def get_users():
     page_data = response.json()
     total_pages = int(page_data["page_count"]) + 1
 
+    def get_page(page):
+        url = f"{API_ENDPOINT_USER_LIST}?page_number={str(page)}"
+        return SESSION.get(url=url).json()
+
+    # the first page is already loaded, fetch the remaining ones concurrently
+    pages = [page_data]
+    if total_pages > 2:
+        with ThreadPoolExecutor(max_workers=min(16, total_pages - 2)) as executor:
+            pages.extend(executor.map(get_page, range(2, total_pages)))
+
     all_users = []
 
-    for page in range(1, total_pages):
-        url = f"{API_ENDPOINT_USER_LIST}?page_number={str(page)}"
-        user_data = requests.get(url=url, headers=AUTHORIZATION_HEADER).json()
+    for user_data in pages:
         users = [
             (
                 user["email"],
@@ -230,26 +384,47 @@ def get_users():
     return all_users
 
 
+INVALID_TOPIC_CHARS = regex.compile(r'[<>:"/\\|?*\x00-\x1F]')
+
+
+def parse_zoom_timestamp(timestamp):
+    """Parse the ISO 8601 timestamps returned by Zoom (e.g. 2024-01-31T14:00:00Z)"""
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(timestamp)
+    except ValueError:
+        return parser.parse(timestamp)
+
+
 def format_filename(params):
-    file_extension = params["file_extension"].lower()
     recording = params["recording"]
-    recording_id = params["recording_id"]
     recording_type = params["recording_type"]
 
-    invalid_chars_pattern = r'[<>:"/\\|?*\x00-\x1F]'
-    topic = regex.sub(invalid_chars_pattern, "", recording["topic"])
-    rec_type = recording_type.replace("_", " ").title()
-    meeting_time_utc = parser.parse(recording["start_time"]).replace(
+    meeting_time_utc = parse_zoom_timestamp(recording["start_time"]).replace(
         tzinfo=timezone.utc
     )
     meeting_time_local = meeting_time_utc.astimezone(MEETING_TIMEZONE)
-    year = meeting_time_local.strftime("%Y")
-    month = meeting_time_local.strftime("%m")
-    day = meeting_time_local.strftime("%d")
-    meeting_time = meeting_time_local.strftime(MEETING_STRFTIME)
+    year, month, day = meeting_time_local.strftime("%Y %m %d").split()
+
+    # values available to the filename and folder templates
+    context = {
+        "file_extension": params["file_extension"].lower(),
+        "recording": recording,
+        "recording_id": params["recording_id"],
+        "recording_type": recording_type,
+        "topic": INVALID_TOPIC_CHARS.sub("", recording["topic"]),
+        "rec_type": recording_type.replace("_", " ").title(),
+        "meeting_time_utc": meeting_time_utc,
+        "meeting_time_local": meeting_time_local,
+        "year": year,
+        "month": month,
+        "day": day,
+        "meeting_time": meeting_time_local.strftime(MEETING_STRFTIME),
+    }
 
-    filename = MEETING_FILENAME.format(**locals())
-    folder = MEETING_FOLDER.format(**locals())
+    filename = MEETING_FILENAME.format_map(context)
+    folder = MEETING_FOLDER.format_map(context)
     return (filename, folder)
 
 
@@ -279,6 +454,36 @@ def get_downloads(recording):
     return downloads
 
 
+def get_folder_names(recordings):
+    """Return the distinct folder names the given recordings will be saved to"""
+    folder_names = set()
+    for recording in recordings:
+        if recording.get("uuid") in COMPLETED_MEETING_IDS:
+            continue
+
+        try:
+            downloads = get_downloads(recording)
+        except Exception:
+            continue
+
+        for _, file_extension, _, recording_type, recording_id in downloads:
+            if recording_id in COMPLETED_MEETING_IDS:
+                continue
+
+            params = {
+                "file_extension": file_extension,
+                "recording": recording,
+                "recording_id": recording_id,
+                "recording_type": recording_type,
+            }
+            try:
+                folder_names.add(format_filename(params)[1])
+            except Exception:
+                continue  # process_recording reports the error for this file
+
+    return folder_names
+
+
 def get_recordings(email, page_size, rec_start_date, rec_end_date):
     # Format dates as YYYY-MM-DD for Zoom API
     start_date_formatted = rec_start_date.strftime("%Y-%m-%d")
@@ -300,69 +505,237 @@ def per_delta(start, end, delta):
         curr += delta
 
 
-def list_recordings(email):
+def request_recordings(email):
+    """Request every 30-day window of a user's recordings, returning the
+    (post_data, response data) pairs in window order
+    """
+
+    def request_window(window):
+        post_data = get_recordings(email, 300, *window)
+        response = SESSION.get(
+            url=f"https://api.zoom.us/v2/users/{email}/recordings",
+            params=post_data,
+        )
+        return post_data, response.json()
+
+    windows = list(
+        per_delta(RECORDING_START_DATE, RECORDING_END_DATE, timedelta(days=30))
+    )
+
+    # the date windows are independent, request them concurrently
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(windows)))) as executor:
+        return list(executor.map(request_window, windows))
+
+
+def list_recordings(email, results=None):
     """Start date now split into YEAR, MONTH, and DAY variables (Within 6 month range)
     then get recordings within that range
+
+    results can be passed in when request_recordings was already run for email.
     """
+    if results is None:
+        results = request_recordings(email)
 
     recordings = []
 
-    for start, end in per_delta(
-        RECORDING_START_DATE, RECORDING_END_DATE, timedelta(days=30)
-    ):
-        post_data = get_recordings(email, 300, start, end)
-        print(
+    for post_data, recordings_data in results:
+        progress_bar.tqdm.write(
             f"    > Requesting recordings from {post_data['from']} to {post_data['to']}"
         )
 
-        response = requests.get(
-            url=f"https://api.zoom.us/v2/users/{email}/recordings",
-            headers=AUTHORIZATION_HEADER,
-            params=post_data,
-        )
-        recordings_data = response.json()
-
         if "meetings" in recordings_data:
             chunk_recordings = recordings_data["meetings"]
-            print(f"    > Found {len(chunk_recordings)} recordings in this date range")
+            progress_bar.tqdm.write(
+                f"    > Found {len(chunk_recordings)} recordings in this date range"
+            )
             recordings.extend(chunk_recordings)
         else:
-            print(
+            progress_bar.tqdm.write(
                 f"    > No recordings found in this date range. Response: {recordings_data}"
             )
 
     return recordings
 
 
-def download_recording(download_url, email, filename, folder_name):
-    dl_dir = os.sep.join([DOWNLOAD_DIRECTORY, folder_name])
-    sanitized_download_dir = path_validate.sanitize_filepath(dl_dir)
-    sanitized_filename = path_validate.sanitize_filename(filename)
-    full_filename = os.sep.join([sanitized_download_dir, sanitized_filename])
+def preallocate(fd, size):
+    """Reserve size bytes for fd up front, so writes don't keep extending the file"""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd.fileno(), 0, size)
+            return
+        except OSError:
+            pass  # not supported by this filesystem
+    fd.truncate(size)
+
+
+def open_download_file(full_filename):
+    """Create the download directory and open full_filename for writing.
+
+    Another worker removes a shared directory once it's left empty, so the
+    directory is (re)created right before the open and retried if it vanished.
+    """
+    for attempt in range(3):
+        os.makedirs(os.path.dirname(full_filename), exist_ok=True)
+        try:
+            return open(full_filename, "wb")
+        except FileNotFoundError:
+            if attempt == 2:
+                raise
+
+
+def download_stream(response, full_filename, total_size, block_size, prog_bar):
+    """Write response to full_filename, with the disk writes done on a separate
+    thread so the next chunk can be read from the socket meanwhile.
+    """
+    # bounded so a slow disk caps the memory held by pending chunks
+    chunks = queue.Queue(maxsize=8)
+    errors = []
+
+    def writer(fd):
+        while (chunk := chunks.get()) is not None:
+            if errors:
+                continue  # keep draining so the reader never blocks
+            try:
+                fd.write(chunk)  # write video chunk to disk
+            except Exception as e:
+                errors.append(e)
+
+    with open_download_file(full_filename) as fd:
+        if total_size > 0:
+            preallocate(fd, total_size)
+        writer_thread = threading.Thread(target=writer, args=(fd,), daemon=True)
+        writer_thread.start()
+        try:
+            for chunk in response.iter_content(block_size):
+                if errors:
+                    break
+                if STOP_EVENT.is_set():
+                    raise DownloadCancelled("download cancelled")
+                chunks.put(chunk)
+                prog_bar.update(len(chunk))
+        finally:
+            chunks.put(None)
+            writer_thread.join()
+
+        # drop any preallocated space the response didn't fill
+        fd.truncate()
+
+    if errors:
+        raise errors[0]
+
+
+def download_segments(url, full_filename, total_size, block_size, prog_bar):
+    """Download url as DOWNLOAD_SEGMENTS parallel byte ranges into full_filename.
+
+    Returns False if the server doesn't answer the ranged requests with 206,
+    or a segment doesn't deliver exactly the bytes it was asked for.
+    """
+    # preallocate the file so every segment can write at its own offset
+    with open_download_file(full_filename) as fd:
+        preallocate(fd, total_size)
+
+    segment_size = -(-total_size // DOWNLOAD_SEGMENTS)
+    prog_bar_lock = threading.Lock()
+
+    def fetch(start):
+        end = min(start + segment_size, total_size) - 1
+        response = SESSION.get(
+            url,
+            headers={**DOWNLOAD_HEADERS, "Range": f"bytes={start}-{end}"},
+            stream=True,
+        )
+        content_range = response.headers.get("content-range", "")
+        if response.status_code != 206 or not content_range.startswith(
+            f"bytes {start}-{end}/"
+        ):
+            response.close()
+            return False
+
+        written = 0
+        with open(full_filename, "r+b") as fd:
+            fd.seek(start)
+            for chunk in response.iter_content(block_size):
+                if STOP_EVENT.is_set():
+                    raise DownloadCancelled("download cancelled")
+                fd.write(chunk)
+                written += len(chunk)
+                with prog_bar_lock:
+                    prog_bar.update(len(chunk))
+        # a short segment would leave a zero-filled hole in the file
+        return written == end - start + 1
+
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_SEGMENTS) as executor:
+        return all(executor.map(fetch, range(0, total_size, segment_size)))
+
+
+@functools.lru_cache(maxsize=4096)
+def download_dir(folder_name):
+    """Return the sanitized download directory for a recording folder name"""
+    # not os.path.join, which would drop DOWNLOAD_DIRECTORY for a folder_name
+    # starting with a separator
+    return path_validate.sanitize_filepath(
+        os.sep.join([DOWNLOAD_DIRECTORY, folder_name])
+    )
+
+
+def download_failed(response, email, filename):
+    """Report a download answered with an error status instead of the file"""
+    progress_bar.tqdm.write(
+        f"{Color.RED}### The video recording with filename '{filename}' for user with email "
+        f"'{email}' could not be downloaded because {Color.END}'{response.status_code} "
+        f"{response.reason}'"
+    )
+    response.close()
+
+    return False
 
-    os.makedirs(sanitized_download_dir, exist_ok=True)
 
-    response = requests.get(download_url, stream=True)
+def download_recording(download_url, email, filename, full_filename):
+    response = SESSION.get(download_url, headers=DOWNLOAD_HEADERS, stream=True)
+    if not response.ok:
+        return download_failed(response, email, filename)
 
     # total size in bytes.
     total_size = int(response.headers.get("content-length", 0))
-    block_size = 32 * 1024  # 32 Kibibytes
+    block_size = 1024 * 1024  # 1 Mebibyte
 
     # create TQDM progress bar
     prog_bar = progress_bar.tqdm(
-        dynamic_ncols=True, total=total_size, unit="iB", unit_scale=True
+        dynamic_ncols=True,
+        total=total_size,
+        unit="iB",
+        unit_scale=True,
+        unit_divisor=1024,
+        mininterval=0.25,
     )
     try:
-        with open(full_filename, "wb") as fd:
-            for chunk in response.iter_content(block_size):
-                prog_bar.update(len(chunk))
-                fd.write(chunk)  # write video chunk to disk
+        if (
+            DOWNLOAD_SEGMENTS > 1
+            and total_size >= SEGMENTED_DOWNLOAD_THRESHOLD
+            and response.headers.get("accept-ranges") == "bytes"
+        ):
+            response.close()
+            # response.url is the final (redirected) file URL
+            if download_segments(
+                response.url, full_filename, total_size, block_size, prog_bar
+            ):
+                prog_bar.close()
+                return True
+
+            # ranged requests were refused, fall back to a single stream
+            prog_bar.reset()
+            response = SESSION.get(download_url, headers=DOWNLOAD_HEADERS, stream=True)
+            if not response.ok:
+                prog_bar.close()
+                return download_failed(response, email, filename)
+
+        download_stream(response, full_filename, total_size, block_size, prog_bar)
         prog_bar.close()
 
         return True
 
     except Exception as e:
-        print(
+        progress_bar.tqdm.write(
             f"{Color.RED}### The video recording with filename '{filename}' for user with email "
             f"'{email}' could not be downloaded because {Color.END}'{e}'"
         )
@@ -373,7 +746,14 @@ def download_recording(download_url, email, filename, folder_name):
 def load_completed_meeting_ids():
     try:
         with open(COMPLETED_MEETING_IDS_LOG, "r") as fd:
-            [COMPLETED_MEETING_IDS.add(line.strip()) for line in fd]
+            lines = set(map(str.strip, fd.read().splitlines()))
+
+        lines.discard("")
+        COMPLETED_MEETING_IDS.update(lines)
+        # log() records each file as "** Downloaded <recording file id> ..."
+        COMPLETED_MEETING_IDS.update(
+            line.split()[2] for line in lines if line.startswith("** Downloaded ")
+        )
 
     except FileNotFoundError:
         print(
@@ -383,32 +763,267 @@ def load_completed_meeting_ids():
 
 
 def handle_graceful_shutdown(signal_received, frame):
+    if STOP_EVENT.is_set():
+        # second CTRL-C: don't wait for the in-flight transfers to stop
+        print(
+            f"\n{Color.DARK_CYAN}SIGINT or CTRL-C detected again. Aborting.{Color.END}"
+        )
+        os._exit(1)
+
+    STOP_EVENT.set()
     print(
-        f"\n{Color.DARK_CYAN}SIGINT or CTRL-C detected. system.exiting gracefully.{Color.END}"
+        f"\n{Color.DARK_CYAN}SIGINT or CTRL-C detected. system.exiting gracefully "
+        f"(press CTRL-C again to abort immediately).{Color.END}"
     )
 
     system.exit(0)
 
 
-def delete_recording(meeting_id: str, recording_id: str):
-    """Delete the cloud recording for a given meeting ID."""
+def delete_recording(meeting_id: str, recording_id: str) -> bool:
+    """Delete the cloud recording for a given meeting ID.
+
+    Returns whether Zoom accepted the deletion.
+    """
     url = f"https://api.zoom.us/v2/meetings/{meeting_id}/recordings/{recording_id}"
-    resp = requests.delete(url=url, headers=AUTHORIZATION_HEADER)
+    resp = SESSION.delete(url=url)
     if resp.ok:
-        print(
+        progress_bar.tqdm.write(
             f"{Color.GREEN}### Deleted cloud recording RecordingID {recording_id} for MeetingID {meeting_id}{Color.END}"
         )
     else:
-        print(
+        progress_bar.tqdm.write(
             f"{Color.RED}### Failed to delete cloud recording {recording_id} for MeetingID {meeting_id}: "
             f"{resp.status_code} {resp.text}{Color.END}"
         )
+    return resp.ok
+
+
+# deletions don't block the download pipeline, main() waits for them at exit
+DELETE_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def delete_and_log_recording(meeting_id, recording_id, details):
+    """Delete a cloud recording on DELETE_POOL, logging it once Zoom accepted it"""
+    try:
+        if not delete_recording(meeting_id, recording_id):
+            return
+    except Exception as e:
+        progress_bar.tqdm.write(
+            f"{Color.RED}### Failed to delete cloud recording {recording_id} for MeetingID {meeting_id}: "
+            f"{str(e)}{Color.END}"
+        )
+        return
+
+    log(f"** >> Deleted recording {meeting_id,recording_id} - {details} Zoom cloud\n")
+
+
+LOG_LOCK = threading.Lock()
+LOG_FILE = None
 
 
 def log(message):
-    with open(COMPLETED_MEETING_IDS_LOG, "a") as log_file:
-        log_file.write(message)
-        log_file.flush()
+    """Append to the completion log through one handle kept open for the run"""
+    global LOG_FILE
+
+    with LOG_LOCK:
+        if LOG_FILE is None:
+            LOG_FILE = open(COMPLETED_MEETING_IDS_LOG, "a", buffering=1 << 16)
+            atexit.register(LOG_FILE.close)
+        LOG_FILE.write(message)
+        # flushed per entry so an interrupted run still resumes where it stopped
+        LOG_FILE.flush()
+
+
+def process_recording(recording, index, total_count, email, drive_service):
+    """Download the files of one recording, then upload, log and delete them"""
+    try:
+        recording_id = recording["uuid"]
+        if recording_id in COMPLETED_MEETING_IDS:
+            progress_bar.tqdm.write(
+                f"\n==> Skipping already downloaded recording {index + 1} of {total_count}"
+            )
+            return
+
+        meeting_id = recording["id"]
+        topic = recording["topic"]
+        start_time = recording["start_time"]
+        duration = recording["duration"]
+        downloads = get_downloads(recording)
+
+    except Exception as e:
+        progress_bar.tqdm.write(
+            f"{Color.RED}### Failed to get download URLs for recording {index + 1} "
+            f"of {total_count} due to error: {str(e)}{Color.END}"
+        )
+        return
+
+    progress_bar.tqdm.write(f"\n==> Processing recording {index + 1} of {total_count}")
+
+    downloaded = []
+    upload_tasks = []
+    download_dirs = set()  # sanitized download directories used by this recording
+    for (
+        file_type,
+        file_extension,
+        download_url,
+        recording_type,
+        recording_id,
+    ) in downloads:
+        if STOP_EVENT.is_set():
+            return
+
+        if recording_id in COMPLETED_MEETING_IDS:
+            progress_bar.tqdm.write(
+                f"    > Skipping already downloaded file {recording_id}"
+            )
+            continue
+
+        try:
+            params = {
+                "file_extension": file_extension,
+                "recording": recording,
+                "recording_id": recording_id,
+                "recording_type": recording_type,
+            }
+            filename, folder_name = format_filename(params)
+
+            progress_bar.tqdm.write(f"    > Downloading {filename}")
+            sanitized_download_dir = download_dir(folder_name)
+            download_dirs.add(sanitized_download_dir)
+            sanitized_filename = path_validate.sanitize_filename(filename)
+            full_filename = os.path.join(sanitized_download_dir, sanitized_filename)
+
+            if download_recording(download_url, email, filename, full_filename):
+                downloaded.append((recording_id, download_url, full_filename))
+                upload_tasks.append((full_filename, folder_name, sanitized_filename))
+
+        except Exception as e:
+            progress_bar.tqdm.write(
+                f"{Color.RED}### Failed to process file {file_type} "
+                f"for recording {index + 1} of {total_count} due to error: "
+                f"{str(e)}{Color.END}"
+            )
+            continue
+
+    if STOP_EVENT.is_set():
+        return  # unlogged files are downloaded again on the next run
+
+    if GDRIVE_ENABLED and drive_service and upload_tasks:
+        progress_bar.tqdm.write(
+            f"    > Uploading {len(upload_tasks)} files to Google Drive..."
+        )
+        results = drive_service.upload_files(upload_tasks)
+        uploaded = set()
+        for (full_filename, _, _), success in zip(upload_tasks, results):
+            if success:
+                uploaded.add(full_filename)
+                if os.path.exists(full_filename):
+                    os.remove(full_filename)
+
+        # files that failed to upload are retried on the next run, so they are
+        # neither logged as completed nor deleted from the Zoom cloud
+        downloaded = [file for file in downloaded if file[2] in uploaded]
+
+        # remove the download directories left empty, once per recording
+        for sanitized_download_dir in download_dirs:
+            try:
+                os.rmdir(sanitized_download_dir)
+            except OSError:
+                pass  # not empty, or already removed
+
+    for recording_id, download_url, full_filename in downloaded:
+        if VERBOSE_URL:
+            log(
+                f"** Downloaded {recording_id} from \n\t{download_url}\n\t to {full_filename}\n"
+            )
+        else:
+            log(f"** Downloaded {recording_id} to {full_filename}\n")
+        COMPLETED_MEETING_IDS.add(recording_id)
+
+        if DELETE_AFTER_DOWNLOAD:
+            DELETE_POOL.submit(
+                delete_and_log_recording,
+                meeting_id,
+                recording_id,
+                f"{start_time} - {topic} - {duration}",
+            )
+
+
+# number of users whose recording lists are requested ahead of time
+LISTINGS_AHEAD = 2
+
+
+def download_users(users, download_pool, drive_service):
+    """List each user's recordings and process them concurrently on download_pool"""
+    futures = []
+
+    # keep the next LISTINGS_AHEAD users' recording lists in flight, so the next
+    # list is usually ready by the time the current user's recordings are queued
+    listings = {}
+
+    def submit_listing(index):
+        if index < len(users):
+            listings[index] = listing_pool.submit(request_recordings, users[index][1])
+
+    with ThreadPoolExecutor(max_workers=LISTINGS_AHEAD) as listing_pool:
+        for index in range(LISTINGS_AHEAD):
+            submit_listing(index)
+        try:
+            for index, user in enumerate(users):
+                listing = listings.pop(index)
+                submit_listing(index + LISTINGS_AHEAD)
+                try:
+                    futures.extend(
+                        download_user(
+                            user, listing.result(), download_pool, drive_service
+                        )
+                    )
+                except Exception as e:
+                    # keep going, the recordings queued for other users still run
+                    progress_bar.tqdm.write(
+                        f"{Color.RED}### Failed to list recordings for {user[0]} due to "
+                        f"error: {str(e)}{Color.END}"
+                    )
+        finally:
+            for listing in listings.values():
+                listing.cancel()
+
+    # recordings of all users share download_pool, only wait for them at the end
+    for future in as_completed(futures):
+        try:
+            future.result()
+        except Exception as e:
+            progress_bar.tqdm.write(
+                f"{Color.RED}### Failed to process recording due to error: "
+                f"{str(e)}{Color.END}"
+            )
+
+
+def download_user(user, listing, download_pool, drive_service):
+    """Queue one user's recordings on download_pool, returning their futures"""
+    email, user_id, first_name, last_name = user
+    userInfo = (
+        f"{first_name} {last_name} - {email}"
+        if first_name and last_name
+        else f"{email}"
+    )
+    progress_bar.tqdm.write(
+        f"\n{Color.BOLD}Getting recording list for {userInfo}{Color.END}"
+    )
+
+    recordings = list_recordings(user_id, listing)
+    total_count = len(recordings)
+    progress_bar.tqdm.write(f"==> Found {total_count} recordings")
+
+    if GDRIVE_ENABLED and drive_service:
+        drive_service.prepare_folders(get_folder_names(recordings))
+
+    return [
+        download_pool.submit(
+            process_recording, recording, index, total_count, email, drive_service
+        )
+        for index, recording in enumerate(recordings)
+    ]
 
 
 # ################################################################
@@ -417,12 +1032,12 @@ def log(message):
 
 
 def main():
-    # clear the screen buffer
-    os.system("cls" if os.name == "nt" else "clear")
+    # clear the screen buffer with ANSI escapes instead of spawning cls/clear
+    system.stdout.write("\x1b[2J\x1b[H")
+    system.stdout.flush()
 
     # show the logo
-    print(
-        f"""
+    print(f"""
         {Color.DARK_CYAN}
 
 
@@ -446,8 +1061,7 @@ def main():
                         V{APP_VERSION}
 
         {Color.END}
-    """
-    )
+    """)
 
     global GDRIVE_ENABLED
     GDRIVE_ENABLED = True
@@ -468,100 +1082,13 @@ def main():
     print(f"{Color.BOLD}Getting user accounts...{Color.END}")
     users = get_users()
 
-    for email, user_id, first_name, last_name in users:
-        userInfo = (
-            f"{first_name} {last_name} - {email}"
-            if first_name and last_name
-            else f"{email}"
-        )
-        print(f"\n{Color.BOLD}Getting recording list for {userInfo}{Color.END}")
-
-        recordings = list_recordings(user_id)
-        total_count = len(recordings)
-        print(f"==> Found {total_count} recordings")
-
-        for index, recording in enumerate(recordings):
-            try:
-                recording_id = recording["uuid"]
-                meeting_id = recording["id"]
-                topic = recording["topic"]
-                start_time = recording["start_time"]
-                duration = recording["duration"]
-
-                if recording_id in COMPLETED_MEETING_IDS:
-                    print(
-                        f"\n==> Skipping already downloaded recording {index + 1} of {total_count}"
-                    )
-                    continue
-
-                downloads = get_downloads(recording)
-
-            except Exception as e:
-                print(
-                    f"{Color.RED}### Failed to get download URLs for recording {index + 1} "
-                    f"of {total_count} due to error: {str(e)}{Color.END}"
-                )
-                continue
-
-            print(f"\n==> Processing recording {index + 1} of {total_count}")
-
-            for (
-                file_type,
-                file_extension,
-                download_url,
-                recording_type,
-                recording_id,
-            ) in downloads:
-                try:
-                    params = {
-                        "file_extension": file_extension,
-                        "recording": recording,
-                        "recording_id": recording_id,
-                        "recording_type": recording_type,
-                    }
-                    filename, folder_name = format_filename(params)
-
-                    print(f"    > Downloading {filename}")
-                    sanitized_download_dir = path_validate.sanitize_filepath(
-                        os.sep.join([DOWNLOAD_DIRECTORY, folder_name])
-                    )
-                    sanitized_filename = path_validate.sanitize_filename(filename)
-                    full_filename = os.sep.join(
-                        [sanitized_download_dir, sanitized_filename]
-                    )
-
-                    if download_recording(download_url, email, filename, folder_name):
-                        if GDRIVE_ENABLED and drive_service:
-                            print(f"    > Uploading to Google Drive...")
-                            success = drive_service.upload_file(
-                                full_filename, folder_name, sanitized_filename
-                            )
-                            if success and os.path.exists(full_filename):
-                                os.remove(full_filename)
-                                if not os.listdir(sanitized_download_dir):
-                                    os.rmdir(sanitized_download_dir)
-
-                except Exception as e:
-                    print(
-                        f"{Color.RED}### Failed to process file {file_type} "
-                        f"for recording {index + 1} of {total_count} due to error: "
-                        f"{str(e)}{Color.END}"
-                    )
-                    continue
-
-                if VERBOSE_URL:
-                    log(
-                        f"** Downloaded {recording_id} from \n\t{download_url}\n\t to {full_filename}\n"
-                    )
-                else:
-                    log(f"** Downloaded {recording_id} to {full_filename}\n")
-                COMPLETED_MEETING_IDS.add(recording_id)
-
-                if DELETE_AFTER_DOWNLOAD:
-                    delete_recording(meeting_id, recording_id)
-                    log(
-                        f"** >> Deleted recording {meeting_id,recording_id} - {start_time} - {topic} - {duration} Zoom cloud\n"
-                    )
+    download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    try:
+        download_users(users, download_pool, drive_service)
+    finally:
+        # on CTRL-C, let in-flight downloads finish but drop the queued ones
+        download_pool.shutdown(wait=True, cancel_futures=True)
+        DELETE_POOL.shutdown(wait=True)
 
 
 if __name__ == "__main__":